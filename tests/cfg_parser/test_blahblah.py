@@ -32,5 +32,15 @@ def test_screwy_program():
     }
     """)
     assert (cfg.number_of_nodes(), cfg.number_of_edges()) == (20, 26)
+    assert_node_types(cfg, {
+        None: 2,  # FUNC_ENTRY, FUNC_EXIT
+        "declaration": 3,
+        "binary_expression": 3,
+        "update_expression": 2,
+        "true": 2,
+        "false": 2,
+        "expression_statement": 5,
+        "return_statement": 1,
+    })
     assert len(list(nx.simple_cycles(cfg))) == 7
 
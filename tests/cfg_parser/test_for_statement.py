@@ -1,3 +1,4 @@
+import pytest
 from ..utils import *
 import networkx as nx
 
@@ -18,91 +19,69 @@ def test_for_simple():
     FUNC_EXIT_node = get_node_by_label(cfg, "FUNC_EXIT")
     assert get_adj_label(cfg, cond_node, FUNC_EXIT_node) == "False"
 
-def test_for_nocompound():
-    cfg = parse_and_create_cfg("""int main()
+# for loops which leave out parts of the header, as (code, (number of nodes, number of edges))
+FOR_HEADER_CASES = [
+    pytest.param("""int main()
     {
         for (int i = 0; i < 10; i ++)
             x = 0;
     }
-    """)
-    assert (cfg.number_of_nodes(), cfg.number_of_edges()) == (6, 6)
-    assert len(list(nx.simple_cycles(cfg))) == 1
-
-def test_for_noinit():
-    cfg = parse_and_create_cfg("""int main()
+    """, (6, 6), id="nocompound"),
+    pytest.param("""int main()
     {
         for (; i < 10; i ++) {
             x = 0;
         }
     }
-    """)
-    assert (cfg.number_of_nodes(), cfg.number_of_edges()) == (5, 5)
-    assert len(list(nx.simple_cycles(cfg))) == 1
-
-def test_for_nocond():
-    cfg = parse_and_create_cfg("""int main()
+    """, (5, 5), id="noinit"),
+    pytest.param("""int main()
     {
         for (int i = 0; ; i++) {
             x = 0;
         }
     }
-    """)
-    assert (cfg.number_of_nodes(), cfg.number_of_edges()) == (6, 6)
-    assert len(list(nx.simple_cycles(cfg))) == 1
-
-def test_for_noincr():
-    cfg = parse_and_create_cfg("""int main()
+    """, (6, 6), id="nocond"),
+    pytest.param("""int main()
     {
         for (int i = 0; i < 10;) {
             x = 0;
         }
     }
-    """)
-    assert (cfg.number_of_nodes(), cfg.number_of_edges()) == (5, 5)
-    assert len(list(nx.simple_cycles(cfg))) == 1
-
-def test_for_noinitincr():
-    cfg = parse_and_create_cfg("""int main()
+    """, (5, 5), id="noincr"),
+    pytest.param("""int main()
     {
         for (; i < 10;) {
             x = 0;
         }
     }
-    """)
-    assert (cfg.number_of_nodes(), cfg.number_of_edges()) == (4, 4)
-    assert len(list(nx.simple_cycles(cfg))) == 1
-
-def test_for_noinitcond():
-    cfg = parse_and_create_cfg("""int main()
+    """, (4, 4), id="noinitincr"),
+    pytest.param("""int main()
     {
         for (; ; i++) {
             x = 0;
         }
     }
-    """)
-    assert (cfg.number_of_nodes(), cfg.number_of_edges()) == (5, 5)
-    assert len(list(nx.simple_cycles(cfg))) == 1
-
-def test_for_nocondincr():
-    cfg = parse_and_create_cfg("""int main()
+    """, (5, 5), id="noinitcond"),
+    pytest.param("""int main()
     {
         for (int i = 0; ; ) {
             x = 0;
         }
     }
-    """)
-    assert (cfg.number_of_nodes(), cfg.number_of_edges()) == (5, 5)
-    assert len(list(nx.simple_cycles(cfg))) == 1
-
-def test_for_nothing():
-    cfg = parse_and_create_cfg("""int main()
+    """, (5, 5), id="nocondincr"),
+    pytest.param("""int main()
     {
         for (; ; ) {
             x = 0;
         }
     }
-    """)
-    assert (cfg.number_of_nodes(), cfg.number_of_edges()) == (4, 4)
+    """, (4, 4), id="nothing"),
+]
+
+@pytest.mark.parametrize("code,size", FOR_HEADER_CASES)
+def test_for_header(code, size):
+    cfg = parse_and_create_cfg(code)
+    assert (cfg.number_of_nodes(), cfg.number_of_edges()) == size
     assert len(list(nx.simple_cycles(cfg))) == 1
 
 def test_for_nested():
@@ -182,6 +161,7 @@ def test_for_break():
     """)
     assert (cfg.number_of_nodes(), cfg.number_of_edges()) == (15, 17)
     assert len(list(nx.simple_cycles(cfg))) == 1
+    assert_exits_reach_function_exit(cfg)
 
 def test_for_continue():
     cfg = parse_and_create_cfg("""int main()
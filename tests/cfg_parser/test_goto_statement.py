@@ -58,4 +58,4 @@ end:
     x_20_node = get_node_by_code(cfg, "x = 20;")
     x_10_node = get_node_by_code(cfg, "x = 10;")
     assert not any(x_20_node in p for p in nx.all_simple_paths(cfg, goto_node, x_10_node))
-    assert list(nx.all_simple_paths(cfg, FUNC_ENTRY_node, x_20_node)) == []
+    assert not nx.has_path(cfg, FUNC_ENTRY_node, x_20_node)
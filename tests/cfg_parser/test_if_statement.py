@@ -1,24 +1,41 @@
+import pytest
+
 from ..utils import *
+from tree_climber.util import to_csr, edge_label_code, EDGE_LABEL_CODES, CASE_EDGE_CODE, OTHER_EDGE_CODE
 import networkx as nx
 
-def test_if_simple():
-    cfg = parse_and_create_cfg("""int main()
+# shared by test_if_else and test_if_else_csr
+IF_ELSE_CODE = """int main()
     {
-        if (true) {
+        if (x > 1) {
             x += 5;
         }
+        else {
+            x += 50;
+        }
     }
-    """)
-    assert (cfg.number_of_nodes(), cfg.number_of_edges()) == (4, 4)
-    assert nx.is_directed_acyclic_graph(cfg)
+    """
 
-def test_if_nocompound():
-    cfg = parse_and_create_cfg("""int main()
+# an if statement around one statement, with and without braces
+IF_SIMPLE_CASES = [
+    pytest.param("""int main()
+    {
+        if (true) {
+            x += 5;
+        }
+    }
+    """, id="compound"),
+    pytest.param("""int main()
     {
         if (true)
             x += 5;
     }
-    """)
+    """, id="nocompound"),
+]
+
+@pytest.mark.parametrize("code", IF_SIMPLE_CASES)
+def test_if_simple(code):
+    cfg = parse_and_create_cfg(code)
     assert (cfg.number_of_nodes(), cfg.number_of_edges()) == (4, 4)
     assert nx.is_directed_acyclic_graph(cfg)
 
@@ -49,16 +66,7 @@ def test_if_noelse():
     assert nx.is_directed_acyclic_graph(cfg)
 
 def test_if_else():
-    cfg = parse_and_create_cfg("""int main()
-    {
-        if (x > 1) {
-            x += 5;
-        }
-        else {
-            x += 50;
-        }
-    }
-    """)
+    cfg = parse_and_create_cfg(IF_ELSE_CODE)
     assert (cfg.number_of_nodes(), cfg.number_of_edges()) == (5, 5)
     assert nx.is_directed_acyclic_graph(cfg)
 
@@ -76,4 +84,21 @@ def test_if_nested():
     }
     """)
     assert (cfg.number_of_nodes(), cfg.number_of_edges()) == (5, 6)
-    assert nx.is_directed_acyclic_graph(cfg)
\ No newline at end of file
+    assert nx.is_directed_acyclic_graph(cfg)
+
+def test_if_else_csr():
+    cfg = parse_and_create_cfg(IF_ELSE_CODE)
+    nodes, offsets, targets, edge_labels = to_csr(cfg)
+    assert len(offsets) == cfg.number_of_nodes() + 1
+    assert len(targets) == len(edge_labels) == cfg.number_of_edges()
+
+    i = nodes.index(get_node_by_code(cfg, "x > 1"))
+    cond_labels = edge_labels[offsets[i]:offsets[i + 1]]
+    assert (cond_labels == EDGE_LABEL_CODES["True"]).any()
+    assert (cond_labels == EDGE_LABEL_CODES["False"]).any()
+
+def test_edge_label_code():
+    assert edge_label_code("True") == EDGE_LABEL_CODES["True"]
+    assert edge_label_code("case 1:") == CASE_EDGE_CODE
+    assert edge_label_code("default :") == CASE_EDGE_CODE
+    assert edge_label_code("not a label") == OTHER_EDGE_CODE
@@ -1,3 +1,4 @@
+import pytest
 from ..utils import *
 import networkx as nx
 
@@ -10,30 +11,32 @@ def test_return_exclude():
     """)
     assert (cfg.number_of_nodes(), cfg.number_of_edges()) == (3, 2)
     assert nx.is_directed_acyclic_graph(cfg)
+    assert_exits_reach_function_exit(cfg)
     assert not any("x" in attr["label"] for _, attr in cfg.nodes(data=True))
 
-def test_continue_exclude():
-    cfg = parse_and_create_cfg("""int main()
+# jumps which skip the rest of a loop body, as (code, number of cycles)
+LOOP_JUMP_CASES = [
+    pytest.param("""int main()
     {
         for (;;) {
             continue;
             x += 5;
         }
     }
-    """)
-    assert (cfg.number_of_nodes(), cfg.number_of_edges()) == (4, 4)
-    assert len(list(nx.simple_cycles(cfg))) == 1
-    assert not any("x" in attr["label"] for _, attr in cfg.nodes(data=True))
-
-def test_break_exclude():
-    cfg = parse_and_create_cfg("""int main()
+    """, 1, id="continue"),
+    pytest.param("""int main()
     {
         for (;;) {
             break;
             x += 5;
         }
     }
-    """)
+    """, 0, id="break"),
+]
+
+@pytest.mark.parametrize("code,num_cycles", LOOP_JUMP_CASES)
+def test_loop_jump_exclude(code, num_cycles):
+    cfg = parse_and_create_cfg(code)
     assert (cfg.number_of_nodes(), cfg.number_of_edges()) == (4, 4)
-    assert len(list(nx.simple_cycles(cfg))) == 0
+    assert len(list(nx.simple_cycles(cfg))) == num_cycles
     assert not any("x" in attr["label"] for _, attr in cfg.nodes(data=True))
@@ -1,14 +1,29 @@
+import pytest
 from ..utils import *
 import networkx as nx
 
-def test_while_simple():
-    cfg = parse_and_create_cfg("""int main()
+# loops around one statement, with "true" as the condition
+SIMPLE_LOOP_CASES = [
+    pytest.param("""int main()
     {
         while (true) {
             x = 0;
         }
     }
-    """)
+    """, id="while"),
+    pytest.param("""int main()
+    {
+        do {
+            x = 0;
+        }
+        while (true);
+    }
+    """, id="do_while"),
+]
+
+@pytest.mark.parametrize("code", SIMPLE_LOOP_CASES)
+def test_loop_simple(code):
+    cfg = parse_and_create_cfg(code)
     assert (cfg.number_of_nodes(), cfg.number_of_edges()) == (4, 4)
     assert len(list(nx.simple_cycles(cfg))) == 1
 
@@ -18,8 +33,9 @@ def test_while_simple():
     FUNC_EXIT_node = get_node_by_label(cfg, "FUNC_EXIT")
     assert get_adj_label(cfg, true_node, FUNC_EXIT_node) == "False"
 
-def test_while_nested():
-    cfg = parse_and_create_cfg("""int main()
+# nested loops, as (code, (number of nodes, number of edges), number of cycles)
+NESTED_LOOP_CASES = [
+    pytest.param("""int main()
     {
         while (true) {
             while (false) {
@@ -27,30 +43,8 @@ def test_while_nested():
             }
         }
     }
-    """)
-    assert (cfg.number_of_nodes(), cfg.number_of_edges()) == (5, 6)
-    assert len(list(nx.simple_cycles(cfg))) == 2
-
-def test_do_while_simple():
-    cfg = parse_and_create_cfg("""int main()
-    {
-        do {
-            x = 0;
-        }
-        while (true);
-    }
-    """)
-    assert (cfg.number_of_nodes(), cfg.number_of_edges()) == (4, 4)
-    assert len(list(nx.simple_cycles(cfg))) == 1
-    
-    true_node = get_node_by_code(cfg, "true")
-    x_0_node = get_node_by_code(cfg, "x = 0;")
-    assert get_adj_label(cfg, true_node, x_0_node) == "True"
-    FUNC_EXIT_node = get_node_by_label(cfg, "FUNC_EXIT")
-    assert get_adj_label(cfg, true_node, FUNC_EXIT_node) == "False"
-
-def test_do_while_nested():
-    cfg = parse_and_create_cfg("""int main()
+    """, (5, 6), 2, id="while"),
+    pytest.param("""int main()
     {
         do {
             while (x < 1) {
@@ -62,6 +56,11 @@ def test_do_while_nested():
         }
         while (x < 3);
     }
-    """)
-    assert (cfg.number_of_nodes(), cfg.number_of_edges()) == (6, 8)
-    assert len(list(nx.simple_cycles(cfg))) == 3
+    """, (6, 8), 3, id="do_while"),
+]
+
+@pytest.mark.parametrize("code,size,num_cycles", NESTED_LOOP_CASES)
+def test_loop_nested(code, size, num_cycles):
+    cfg = parse_and_create_cfg(code)
+    assert (cfg.number_of_nodes(), cfg.number_of_edges()) == size
+    assert len(list(nx.simple_cycles(cfg))) == num_cycles
@@ -1,7 +1,6 @@
 import pytest
 
 from ..utils import *
-from tree_climber.duc_parser import DUCParser
 
 
 def test_get_def_use_chain():
@@ -24,7 +23,7 @@ def test_get_def_use_chain():
         return x;
     }
     """
-    duc = DUCParser(code)
+    duc = parse_and_create_duc(code)
     cfg = duc.graph["parents"]["CFG"]
 
     init_x_node = get_node_by_code(duc, "int x = 0;")
@@ -97,7 +96,7 @@ def test_debug():
         return x;
     }
     """
-    duc = DUCParser(code)
+    duc = parse_and_create_duc(code)
     cfg = duc.graph["parents"]["CFG"]
 
     _, ax = plt.subplots(2)
@@ -1,11 +1,10 @@
 import pytest
 
 from ..utils import *
-from tree_climber.duc_parser.reaching_def import ReachingDefinitionSolver
+from tree_climber.dataflow.reaching_def import ReachingDefinitionSolver
 
-
-def test_solve():
-    code = """int main()
+# shared by test_solve and test_debug so it is only parsed once
+SOLVE_CODE = """int main()
     {
         int x = 0;
         if (true) {
@@ -16,9 +15,10 @@ def test_solve():
         return x;
     }
     """
-    tree = c_parser.parse(bytes(code, "utf8"))
-    ast = ASTParser.make_ast(tree.root_node)
-    cfg = CFGParser.make_cfg(ast)
+
+
+def test_solve():
+    cfg = parse_and_create_cfg(SOLVE_CODE)
     solver = ReachingDefinitionSolver(cfg)
     solution_in, solution_out = solver.solve()
     assert solution_out[get_node_by_code(cfg, "return x;")] == {2}
@@ -27,20 +27,7 @@ def test_solve():
 
 @pytest.mark.slow
 def test_debug():
-    code = """int main()
-    {
-        int x = 0;
-        if (true) {
-            x += 5;
-        }
-        printf("%d\\n", x);
-        x = 10;
-        return x;
-    }
-    """
-    tree = c_parser.parse(bytes(code, "utf8"))
-    ast = ASTParser.make_ast(tree.root_node)
-    cfg = CFGParser.make_cfg(ast)
+    cfg = parse_and_create_cfg(SOLVE_CODE)
     solver = ReachingDefinitionSolver(cfg, verbose=1)
     solution_in, solution_out = solver.solve()
     draw(
@@ -1,13 +1,38 @@
+import collections
+import functools
+import weakref
+
 from tree_climber.cfg_parser import CFGParser
+from tree_climber.duc_parser import DUCParser
 from tree_climber.config import DRAW_CFG
 import networkx as nx
 import matplotlib.pyplot as plt
 
+# names exported to the tests by "from ..utils import *", so that the imports above do not leak into them
+__all__ = [
+    "nx",
+    "plt",
+    "draw",
+    "parse_and_create_cfg",
+    "parse_and_create_duc",
+    "get_adj_label",
+    "index_by_code",
+    "index_by_node_type",
+    "index_by_label",
+    "get_node_by_code",
+    "assert_node_types",
+    "assert_exits_reach_function_exit",
+    "get_node_by_label",
+]
+
 def draw(cfg, dataflow_solution=None, ax=None):
     pos = nx.nx_pydot.graphviz_layout(cfg, prog="dot")
     nx.draw_networkx_nodes(cfg, pos=pos, ax=ax)
-    double_edges = [(u, v, attr.get("label", "")) for u, v, attr in cfg.edges(data=True) if u in cfg.successors(v) and v in cfg.successors(u)]
-    single_edges = [(u, v, attr.get("label", "")) for u, v, attr in cfg.edges(data=True) if (u, v, attr.get("label", "")) not in double_edges]
+    # split edges into those with a reverse edge, which are drawn curved, and the rest in one pass
+    double_edges = []
+    single_edges = []
+    for u, v, attr in cfg.edges(data=True):
+        (double_edges if cfg.has_edge(v, u) else single_edges).append((u, v, attr.get("label", "")))
     nx.draw_networkx_edges(cfg, pos=pos, edgelist=[(u, v) for u, v, label in single_edges], ax=ax)
     nx.draw_networkx_edge_labels(cfg, pos=pos, edge_labels={(u, v): label for u, v, label in single_edges})
     nx.draw_networkx_edges(cfg, pos=pos, edgelist=[(u, v) for u, v, label in double_edges], connectionstyle=f"arc3,rad=0.1")
@@ -18,21 +43,79 @@ def draw(cfg, dataflow_solution=None, ax=None):
     plt.show()
 
 
+@functools.lru_cache(maxsize=None)
+def _create_cfg(code):
+    return CFGParser.parse(code)
+
 def parse_and_create_cfg(code, print_ast=False, draw_cfg=bool(DRAW_CFG)):
-    return CFGParser(code)
+    """parse code into a CFG, cached per code snippet since tests only read the result"""
+    return _create_cfg(code)
+
+@functools.lru_cache(maxsize=None)
+def parse_and_create_duc(code):
+    """parse code into a DUC, cached per code snippet since tests only read the result"""
+    # build on the cached CFG, so a snippet used by both CFG and DUC tests is only parsed once
+    return DUCParser.parse(parse_and_create_cfg(code))
 
 def get_adj_label(cfg, u, v):
     """get label of first edge connecting u and v in cfg"""
     return list(cfg.adj[u][v].values())[0].get("label", "<NO LABEL>")
 
+# graph -> dict of attribute value -> list of nodes, filled by index_by_code, index_by_node_type and index_by_label
+_code_indexes = weakref.WeakKeyDictionary()
+_node_type_indexes = weakref.WeakKeyDictionary()
+_label_indexes = weakref.WeakKeyDictionary()
+
+def _index_nodes(cfg, indexes, key, default):
+    """index the nodes of cfg by one attribute in one pass, reused until cfg is garbage collected"""
+    index = indexes.get(cfg)
+    if index is None:
+        index = collections.defaultdict(list)
+        for n, attr in cfg.nodes(data=True):
+            index[attr.get(key, default)].append(n)
+        # plain dict, so that looking up a missing value does not insert it
+        index = indexes[cfg] = dict(index)
+    return index
+
+def index_by_code(cfg):
+    """index the nodes of cfg by their code"""
+    return _index_nodes(cfg, _code_indexes, "code", "<NO CODE>")
+
+def index_by_node_type(cfg):
+    """index the nodes of cfg by their node type"""
+    return _index_nodes(cfg, _node_type_indexes, "node_type", None)
+
+def index_by_label(cfg):
+    """index the nodes of cfg by their label"""
+    return _index_nodes(cfg, _label_indexes, "label", "<NO LABEL>")
+
 def get_node_by_code(cfg, code, get="first"):
-    matches = (n for n, attr in cfg.nodes(data=True) if code == attr.get("code", "<NO CODE>"))
+    index = index_by_code(cfg)
     if get == "first":
-        return next(matches)
+        if code not in index:
+            raise AssertionError(f"no node with code {code!r}")
+        return index[code][0]
     elif get == "all":
-        return list(matches)
+        return list(index[code]) if code in index else []
     else:
         raise NotImplementedError(get)
 
+def assert_node_types(cfg, expected):
+    """assert how many nodes in cfg have each node type, e.g. {"declaration": 2}"""
+    index = index_by_node_type(cfg)
+    for node_type, count in expected.items():
+        actual = len(index.get(node_type, ()))
+        assert actual == count, f"{node_type}: got {actual}, want {count}"
+
+def assert_exits_reach_function_exit(cfg):
+    """assert that every return statement in cfg can reach FUNC_EXIT"""
+    # search backward from FUNC_EXIT once instead of forward from each return
+    exit_reachers = nx.ancestors(cfg, get_node_by_label(cfg, "FUNC_EXIT"))
+    for n in index_by_node_type(cfg).get("return_statement", ()):
+        assert n in exit_reachers, cfg.nodes[n]["code"]
+
 def get_node_by_label(cfg, label):
-    return next(n for n, attr in cfg.nodes(data=True) if label == attr.get("label", "<NO LABEL>"))
+    index = index_by_label(cfg)
+    if label not in index:
+        raise AssertionError(f"no node with label {label!r}")
+    return index[label][0]
@@ -1,26 +1,51 @@
 import networkx as nx
-from tree_climber.util import extract_subgraph
 
 def detect_npd(cpg):
     """
-    Detect Null-Pointer Dereference bugs using reaching definitions
+    Detect Null-Pointer Dereference bugs using reaching definitions.
+    Print the report for each possible bug, and return the reports.
     """
 
-    # Extract AST and DUC from CPG for manipulation
-    ast = extract_subgraph(cpg, "AST")
-    duc = extract_subgraph(cpg, "DUC")
+    # Extract AST and DUC from CPG for manipulation, in one pass over the CPG edges.
+    # Plain graphs are walked faster than edge subgraph views, which filter every lookup;
+    # node attributes are still read from the CPG.
+    ast_edges = []
+    duc_edges = []
+    for u, v, attr in cpg.edges(data=True):
+        graph_type = attr["graph_type"]
+        if graph_type == "AST":
+            ast_edges.append((u, v))
+        elif graph_type == "DUC":
+            duc_edges.append((u, v, attr))
+    ast = nx.DiGraph(ast_edges)
+    duc = nx.DiGraph(duc_edges)
+
+    # Find the NULLs and the candidate assignments in one pass over the nodes
+    nulls = []
+    assignments = []
+    for n, attr in cpg.nodes(data=True):
+        node_type = attr.get("node_type", "<NO TYPE>")
+        if node_type == "null":
+            if n in ast:
+                nulls.append(n)
+        elif node_type in ("expression_statement", "init_declarator"):
+            assignments.append(n)
+
+    # Index the AST nodes which contain a NULL, walking up once from each NULL
+    # instead of searching the descendants of every candidate assignment.
+    # Each AST node has one parent, so stop at the first ancestor which is already indexed.
+    has_null = set()
+    for m in nulls:
+        parents = ast.pred[m]
+        while parents:
+            parent = next(iter(parents))
+            if parent in has_null:
+                break
+            has_null.add(parent)
+            parents = ast.pred[parent]
 
     # Get all NULL assignments
-    null_assignment = [
-        n
-        for n, attr in cpg.nodes(data=True)
-        if attr.get("node_type", "<NO TYPE>")
-        in ("expression_statement", "init_declarator")
-        and any(
-            ast.nodes[m].get("node_type", "<NO TYPE>") == "null"
-            for m in nx.descendants(ast, n)
-        )
-    ]
+    null_assignment = [n for n in assignments if n in has_null]
 
     def succ(n, typ):
         """Return the next successor with a given node type."""
@@ -33,6 +58,7 @@ def detect_npd(cpg):
             None,
         )
 
+    reports = []
     # Starting from NULL assignments...
     for ass in null_assignment:
         # Find usages...
@@ -46,6 +72,10 @@ def detect_npd(cpg):
                     id_expr_attr = cpg.nodes[id_expr]
                     # To printf...
                     if id_expr_attr["code"] == "printf":
-                        print(
-                            f"""possible npd of {next(attr["label"] for u, v, k, attr in duc.edges(data=True, keys=True) if u == ass and v == usage)} at line {id_expr_attr["start"][0]+1} column {id_expr_attr["start"][1]+1}: {usage_attr["code"]}"""
+                        reports.append(
+                            f"""possible npd of {duc.adj[ass][usage]["label"]} at line {id_expr_attr["start"][0]+1} column {id_expr_attr["start"][1]+1}: {usage_attr["code"]}"""
                         )
+    # write all reports at once rather than one print per report
+    if reports:
+        print("\n".join(reports))
+    return reports
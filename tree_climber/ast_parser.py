@@ -1,25 +1,48 @@
+import functools
+import sys
+import threading
 import warnings
 
 from pathlib import Path
 import networkx as nx
-from tree_sitter import Node, Tree
-from tree_sitter_languages import get_parser
+from tree_sitter import Node, Parser, Tree
+from tree_sitter_languages import get_language
 
 from tree_climber.base_parser import BaseParser
 from tree_climber.base_visitor import BaseVisitor
 from tree_climber.util import Counter
 
 
+_parsers = threading.local()
+
+
+@functools.lru_cache(maxsize=None)
+def get_c_language():
+    """Get the tree-sitter C language, loaded once per process and shared by all parsers."""
+    return get_language("c")
+
+
+def get_c_parser():
+    """Get the tree-sitter C parser, created once per thread because parsers are not thread-safe."""
+    parser = getattr(_parsers, "c", None)
+    if parser is None:
+        parser = _parsers.c = Parser()
+        parser.set_language(get_c_language())
+    return parser
+
+
 def assert_boolean_expression(n):
+    # n.type makes a new string on each access, so read it once and check both suffixes in one call
+    node_type = n.type
     assert (
-        n.type.endswith("_statement")
-        or n.type.endswith("_expression")
-        or n.type in ("true", "false", "identifier", "number_literal")  # TODO: handle ERROR (most often shows up as comma_expression in for loop conditional)
-    ), (n, n.type, n.text.decode())
+        node_type.endswith(("_statement", "_expression"))
+        or node_type in ("true", "false", "identifier", "number_literal")  # TODO: handle ERROR (most often shows up as comma_expression in for loop conditional)
+    ), (n, node_type, n.text.decode())
 
 
 def check_ast_error_in_children(n):
-    if any(c.type == "ERROR" for c in n.children):
+    # has_error is tracked by tree-sitter for the whole subtree, so only look at the children when it is set
+    if n.has_error and any(c.type == "ERROR" for c in n.children):
         raise AstErrorException(n.text.decode())
 
 
@@ -27,6 +50,23 @@ class AstErrorException(Exception):
     pass
 
 
+def attr_to_label(node_type, code):
+    """Make a node label from its type and the first line of its code, trimmed to a max length."""
+    max_len = 27
+    # only split the start of the code, the rest of it never shows up in the label
+    lines = code[: max_len + 1].splitlines()
+    first_line = lines[0] if lines else ""
+    trimmed_code = first_line[:max_len]
+    if len(first_line) > max_len:
+        trimmed_code += "..."
+    else:
+        # the first line is complete, check for any code after its line break
+        line_break_len = 2 if code.startswith("\r\n", len(first_line)) else 1
+        if len(code) > len(first_line) + line_break_len:
+            trimmed_code += "..."
+    return f"{node_type}\n{trimmed_code}"
+
+
 class ASTParser(BaseVisitor, BaseParser):
     """
     AST visitor which creates a CFG.
@@ -42,9 +82,10 @@ class ASTParser(BaseVisitor, BaseParser):
     @staticmethod
     def parse(data, strict=True):
         if isinstance(data, Path):
-            return ASTParser.parse(data.read_text())
+            # tree-sitter parses bytes, so skip decoding the file only to encode it again
+            return ASTParser.parse(data.read_bytes(), strict=strict)
         elif isinstance(data, str) or isinstance(data, bytes):
-            parser = get_parser("c")
+            parser = get_c_parser()
             if isinstance(data, str):
                 data = data.encode("utf-8")
             root_node = parser.parse(data).root_node
@@ -54,6 +95,12 @@ class ASTParser(BaseVisitor, BaseParser):
             root_node = data
         else:
             raise NotImplementedError(type(data))
+        # has_error covers the whole subtree, so check once here instead of at every node
+        if root_node.has_error or root_node.is_missing:
+            if strict:
+                raise AstErrorException(root_node.text.decode())
+            else:
+                warnings.warn("encountered ERROR in AST")
         visitor = ASTParser(strict=strict)
         visitor.visit(root_node, parent_id=None)
         visitor.ast.graph["graph_type"] = "AST"
@@ -66,13 +113,7 @@ class ASTParser(BaseVisitor, BaseParser):
         return n.children
 
     def visit(self, n, **kwargs):
-        if self.strict:
-            if n.has_error or n.is_missing:
-                raise AstErrorException(n.text.decode())
-        else:
-            warnings.warn("encountered ERROR in AST")
-
-        return getattr(self, f"visit_{self.get_type(n)}", self.visit_default)(n=n, **kwargs)
+        return self.get_visitor(n.type)(self, n=n, **kwargs)
 
     def visit_children(self, n, **kwargs):
         for i, c in enumerate(n.children):
@@ -81,40 +122,20 @@ class ASTParser(BaseVisitor, BaseParser):
                 break
 
     def visit_for_statement(self, n, **kwargs):
-        children = n.children
         check_ast_error_in_children(n)
-        children = [c for c in children if c.type != "comment"]
-        i = 0
-        while children[i].type != "(":
-            i += 1
-        i += 1
-        if children[i].type == "declaration":
-            has_init = True
-            i += 1
-        elif children[i].type == ";":
-            has_init = False
-            i += 1
-        else:
-            assert children[i].type.endswith("_expression") or children[i].type in ("number_literal", "identifier"), (children[i], children[i].type)
-            has_init = True
-            i += 1
-            assert children[i].type == ";"
-            i += 1
-        # pointing after semicolon
-        if children[i].type == ";":
-            has_cond = False
-        else:
-            assert_boolean_expression(children[i])
-            has_cond = True
-            i += 1
-        # pointing at semicolon
-        assert children[i].type == ";", (children[i], children[i].type, children[i].text.decode())
-        i += 1
-        if children[i].type == ")":
-            has_incr = False
-        else:
-            assert children[i].type.endswith("_expression") or children[i].type in ("number_literal", "identifier"), (children[i], children[i].type)
-            has_incr = True
+        # look up the clauses by field in tree-sitter instead of stepping over the punctuation in Python
+        init = n.child_by_field_name("initializer")
+        has_init = init is not None
+        if has_init and init.type != "declaration":
+            assert init.type.endswith("_expression") or init.type in ("number_literal", "identifier"), (init, init.type)
+        cond = n.child_by_field_name("condition")
+        has_cond = cond is not None
+        if has_cond:
+            assert_boolean_expression(cond)
+        incr = n.child_by_field_name("update")
+        has_incr = incr is not None
+        if has_incr:
+            assert incr.type.endswith("_expression") or incr.type in ("number_literal", "identifier"), (incr, incr.type)
         self.visit_default(
             n, has_init=has_init, has_cond=has_cond, has_incr=has_incr, **kwargs
         )
@@ -125,36 +146,37 @@ class ASTParser(BaseVisitor, BaseParser):
         label_end = 0
         while children[label_end].type != ":":
             label_end += 1
+        # text of the label up to and including the colon, e.g. "case 1:"
+        case_text = n.text[: children[label_end].end_byte - n.start_byte].decode()
         label_end -= 1
         body_begin = label_end + 2
-        is_default = any(c for c in n.children if c.text.decode() == "default")
-        self.visit_default(n, body_begin=body_begin, is_default=is_default, **kwargs)
+        is_default = any(c.type == "default" for c in children)
+        self.visit_default(n, body_begin=body_begin, is_default=is_default, case_text=case_text, **kwargs)
+
+    def visit_labeled_statement(self, n, **kwargs):
+        children = n.children
+        label_end = 0
+        while children[label_end].type != ":":
+            label_end += 1
+        # text of the label up to and including the colon, e.g. "end:"
+        label_text = n.text[: children[label_end].end_byte - n.start_byte].decode()
+        self.visit_default(n, label_text=label_text, **kwargs)
 
     def visit_default(self, n, parent_id, **kwargs):
-        code = n.text.decode()
         my_id = self.counter.get_and_increment()
         if parent_id is None:
             self.ast.graph["root_node"] = my_id
-        if n.is_named and n.type != "comment":
-
-            def attr_to_label(node_type, code):
-                lines = code.splitlines()
-                if len(lines) > 0:
-                    code = lines[0]
-                    max_len = 27
-                    trimmed_code = code[:max_len]
-                    if len(lines) > 1 or len(code) > max_len:
-                        trimmed_code += "..."
-                else:
-                    trimmed_code = code
-                return node_type + "\n" + trimmed_code
-
+        # n.type makes a new string on each access; intern it so that all nodes of a type share one string
+        node_type = sys.intern(n.type)
+        if n.is_named and node_type != "comment":
+            # only decode text for nodes which are kept in the AST
+            code = n.text.decode()
             self.ast.add_node(
                 my_id,
                 n=n,
-                label=attr_to_label(n.type, code),
+                label=attr_to_label(node_type, code),
                 code=code,
-                node_type=n.type,
+                node_type=node_type,
                 start=n.start_point,
                 end=n.end_point,
                 **kwargs
@@ -1,15 +1,30 @@
 import abc
 
+from tree_climber.config import DEBUG
+
 class BaseVisitor(abc.ABC):
     """
     Extensible AST visitor.
-    Traverses and prints all nodes recursively by default.
+    Traverses all nodes recursively by default, printing them if tree_climber__DEBUG is set.
     """
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # node type -> unbound visitor, filled in by get_visitor
+        cls._visitors = {}
+
+    def get_visitor(self, node_type):
+        """Get the unbound visitor for a node type, looked up once per class."""
+        visitor = self._visitors.get(node_type)
+        if visitor is None:
+            cls = type(self)
+            visitor = self._visitors[node_type] = getattr(cls, f"visit_{node_type}", cls.visit_default)
+        return visitor
+
     @abc.abstractmethod
     def visit(self, n, **kwargs):
         """Delegate to the appropriate visitor."""
-        return getattr(self, f"visit_{self.get_type(n)}", self.visit_default)(n=n, **kwargs)
+        return self.get_visitor(self.get_type(n))(self, n=n, **kwargs)
 
     def visit_children(self, n, **kwargs):
         """Visit all children of a node, breaking if the visitor returns false."""
@@ -20,6 +35,8 @@ class BaseVisitor(abc.ABC):
 
     def visit_default(self, n, **kwargs):
         """Default visitor for nodes which are not implemented."""
-        print("enter", n, "kwargs", kwargs)
+        if DEBUG:
+            print("enter", n, "kwargs", kwargs)
         self.visit_children(n)
-        print("exit", n)
+        if DEBUG:
+            print("exit", n)
@@ -1,3 +1,4 @@
+import itertools
 import warnings
 from collections import defaultdict
 
@@ -7,7 +8,7 @@ from matplotlib import pyplot as plt
 from tree_climber.ast_parser import ASTParser
 from tree_climber.base_parser import BaseParser
 from tree_climber.base_visitor import BaseVisitor
-from tree_climber.util import Counter
+from tree_climber.util import Counter, dense_descendants
 
 
 class CFGParser(BaseVisitor, BaseParser):
@@ -26,6 +27,7 @@ class CFGParser(BaseVisitor, BaseParser):
         self.continue_fringe = []
         self.gotos = {}
         self.labels = {}
+        self.returns = set()
 
     @staticmethod
     def parse(data):
@@ -72,9 +74,7 @@ class CFGParser(BaseVisitor, BaseParser):
         return list(self.ast.successors(n))
 
     def visit(self, n, **kwargs):
-        return getattr(
-            self, "visit_" + self.ast.nodes[n]["node_type"], self.visit_default
-        )(n=n, **kwargs)
+        return self.get_visitor(self.ast.nodes[n]["node_type"])(self, n=n, **kwargs)
 
     def visit_children(self, n, **kwargs):
         for c in self.ast.successors(n):
@@ -119,7 +119,7 @@ class CFGParser(BaseVisitor, BaseParser):
             kwargs = {}
             if edge_type is not None:
                 kwargs["label"] = str(edge_type)
-            self.cfg.add_edges_from(zip(fringe, [dst_node_id] * len(self.fringe)), **kwargs)
+            self.cfg.add_edges_from(zip(fringe, itertools.repeat(dst_node_id)), **kwargs)
         self.fringe = []
 
     """
@@ -129,6 +129,7 @@ class CFGParser(BaseVisitor, BaseParser):
     def visit_function_definition(self, n, **kwargs):
         entry_id = self.add_cfg_node(None, "FUNC_ENTRY")
         self.cfg.graph["entry"] = entry_id
+        self.returns = set()
         self.add_edge_from_fringe_to(entry_id)
         self.fringe.append(entry_id)
         self.visit_children(n, **kwargs)
@@ -139,10 +140,12 @@ class CFGParser(BaseVisitor, BaseParser):
             try:
                 self.cfg.add_edge(self.gotos[label], self.labels[label], label="goto")
             except KeyError:
-                warnings.warn("missing goto target. Skipping.", f"label={label}", f"gotos={self.gotos}")
-        for n in nx.descendants(self.cfg, entry_id):
-            attr = self.cfg.nodes[n]
-            if attr.get("n", None) is not None and attr["n"].type == "return_statement":
+                warnings.warn(f"missing goto target. Skipping. label={label} gotos={self.gotos}")
+        # connect the return statements recorded while visiting the body, if they are reachable;
+        # in node order, as when iterating the set from nx.descendants, rather than in search order
+        if self.returns:
+            reachable_returns = self.returns.intersection(dense_descendants(self.cfg, entry_id, self.counter.get()))
+            for n in sorted(reachable_returns):
                 self.cfg.add_edge(n, exit_id, label="return")
         self.fringe.append(exit_id)
 
@@ -168,18 +171,19 @@ class CFGParser(BaseVisitor, BaseParser):
 
     def visit_if_statement(self, n, **kwargs):
         # TODO: Use child_by_field_name where possible
-        condition = self.get_children(self.get_children(n)[0])[0]
+        children = self.get_children(n)
+        condition = self.get_children(children[0])[0]
         condition_id = self.add_cfg_node(condition)
         self.add_edge_from_fringe_to(condition_id)
         self.fringe.append((condition_id, True))
 
-        compound_statement = self.get_children(n)[1]
+        compound_statement = children[1]
         self.visit(compound_statement)
         # NOTE: this assert doesn't work in the case of an if with an empty else
         # assert len(self.fringe) == 1, "fringe should now have last statement of compound_statement"
 
-        if len(self.get_children(n)) > 2:
-            else_compound_statement = self.get_children(n)[2]
+        if len(children) > 2:
+            else_compound_statement = children[2]
             old_fringe = self.fringe
             self.fringe = [(condition_id, False)]
             self.visit(else_compound_statement)
@@ -190,19 +194,20 @@ class CFGParser(BaseVisitor, BaseParser):
     def visit_for_statement(self, n, **kwargs):
         n_attr = self.ast.nodes[n]
         # print(n, n_attr["node_type"], kwargs, n_attr)
+        children = self.get_children(n)
         i = 0
         if n_attr.get("has_init", False):
-            init = self.get_children(n)[i]
+            init = children[i]
             i += 1
         else:
             init = None
         if n_attr.get("has_cond", False):
-            cond = self.get_children(n)[i]
+            cond = children[i]
             i += 1
         else:
             cond = None
         if n_attr.get("has_incr", False):
-            incr = self.get_children(n)[i]
+            incr = children[i]
             i += 1
         else:
             incr = None
@@ -220,7 +225,7 @@ class CFGParser(BaseVisitor, BaseParser):
             self.add_edge_from_fringe_to(cond_id)
         self.fringe.append((cond_id, True))
 
-        compound_statement = self.get_children(n)[i]
+        compound_statement = children[i]
         self.visit(compound_statement)
         # NOTE: this assert doesn't work in the case of an if with an empty else
         # assert len(self.fringe) == 1, "fringe should now have last statement of compound_statement"
@@ -229,14 +234,14 @@ class CFGParser(BaseVisitor, BaseParser):
             self.add_edge_from_fringe_to(incr_id)
             self.cfg.add_edge(incr_id, cond_id)
             self.cfg.add_edges_from(
-                zip(self.continue_fringe, [incr_id] * len(self.continue_fringe)),
+                zip(self.continue_fringe, itertools.repeat(incr_id)),
                 label="continue",
             )
             self.continue_fringe = []
         else:
             self.add_edge_from_fringe_to(cond_id)
             self.cfg.add_edges_from(
-                zip(self.continue_fringe, [cond_id] * len(self.continue_fringe)),
+                zip(self.continue_fringe, itertools.repeat(cond_id)),
                 label="continue",
             )
             self.continue_fringe = []
@@ -246,19 +251,20 @@ class CFGParser(BaseVisitor, BaseParser):
         self.break_fringe = []
 
     def visit_while_statement(self, n, **kwargs):
-        cond = self.get_children(self.get_children(n)[0])[0]
+        children = self.get_children(n)
+        cond = self.get_children(children[0])[0]
         cond_id = self.add_cfg_node(cond)
 
         self.add_edge_from_fringe_to(cond_id)
         self.fringe.append((cond_id, True))
 
-        compound_statement = self.get_children(n)[1]
+        compound_statement = children[1]
         self.visit(compound_statement)
         self.add_edge_from_fringe_to(cond_id)
         self.fringe.append((cond_id, False))
 
         self.cfg.add_edges_from(
-            zip(self.continue_fringe, [cond_id] * len(self.continue_fringe)),
+            zip(self.continue_fringe, itertools.repeat(cond_id)),
             label="continue",
         )
         self.continue_fringe = []
@@ -270,17 +276,18 @@ class CFGParser(BaseVisitor, BaseParser):
         self.add_edge_from_fringe_to(dummy_id)
         self.fringe.append(dummy_id)
 
-        compound_statement = self.get_children(n)[0]
+        children = self.get_children(n)
+        compound_statement = children[0]
         self.visit(compound_statement)
 
-        cond = self.get_children(self.get_children(n)[1])[0]
+        cond = self.get_children(children[1])[0]
         cond_id = self.add_cfg_node(cond)
         self.add_edge_from_fringe_to(cond_id)
         self.cfg.add_edge(cond_id, dummy_id, label=str(True))
         self.fringe.append((cond_id, False))
 
         self.cfg.add_edges_from(
-            zip(self.continue_fringe, [cond_id] * len(self.continue_fringe)),
+            zip(self.continue_fringe, itertools.repeat(cond_id)),
             label="continue",
         )
         self.continue_fringe = []
@@ -288,10 +295,11 @@ class CFGParser(BaseVisitor, BaseParser):
         self.break_fringe = []
 
     def visit_switch_statement(self, n, **kwargs):
-        cond = self.get_children(self.get_children(n)[0])[0]
+        children = self.get_children(n)
+        cond = self.get_children(children[0])[0]
         cond_id = self.add_cfg_node(cond)
         self.add_edge_from_fringe_to(cond_id)
-        cases = self.get_children(self.get_children(n)[1])
+        cases = self.get_children(children[1])
         default_was_hit = False
         for case in cases:
             while self.ast.nodes[case]["node_type"] != "case_statement":
@@ -302,7 +310,7 @@ class CFGParser(BaseVisitor, BaseParser):
                     raise NotImplementedError(self.ast.nodes[case]["node_type"])
             case_children = self.get_children(case)
             case_attr = self.ast.nodes[case]
-            if len(self.get_children(case)) == 0:
+            if len(case_children) == 0:
                 continue
             body_nodes = [
                 c
@@ -311,8 +319,7 @@ class CFGParser(BaseVisitor, BaseParser):
             ]
             if case_attr["is_default"]:
                 default_was_hit = True
-            case_text = self.ast.nodes[case]["code"]
-            case_text = case_text[: case_text.find(":") + 1]
+            case_text = case_attr["case_text"]
             # TODO: append previous cases with no body
             self.fringe.append((cond_id, case_text))
             for body_node in body_nodes:
@@ -327,6 +334,7 @@ class CFGParser(BaseVisitor, BaseParser):
     def visit_return_statement(self, n, **kwargs):
         node_id = self.add_cfg_node(n)
         self.add_edge_from_fringe_to(node_id)
+        self.returns.add(node_id)
         self.visit_default(n, **kwargs)
         # This is meant to skip adding subsequent statements to the CFG.
         # TODO: consider how to handle this with goto statements.
@@ -355,9 +363,7 @@ class CFGParser(BaseVisitor, BaseParser):
         self.visit_default(n, **kwargs)
 
     def add_label_node(self, n):
-        code = self.ast.nodes[n]["code"]
-        code = code[:code.find(":")+1]
-        node_id = self.add_cfg_node(n, code=code)
+        node_id = self.add_cfg_node(n, code=self.ast.nodes[n]["label_text"])
         self.add_edge_from_fringe_to(node_id)
         statement_identifier_attr = self.ast.nodes[self.get_children(n)[0]]
         assert statement_identifier_attr["node_type"] == "statement_identifier"
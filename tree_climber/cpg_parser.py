@@ -3,6 +3,8 @@ Output CPG representation.
 AST annotated with CFG, DUC edges.
 """
 
+from collections import defaultdict
+
 import networkx as nx
 
 from tree_climber.base_parser import BaseParser
@@ -18,9 +20,9 @@ class CPGParser(BaseParser):
         cfg = CFGParser.parse(ast)
         duc = DUCParser.parse(cfg)
 
-        nx.set_edge_attributes(ast, {(u, v): "AST" for u, v in ast.edges()}, "graph_type")
-        nx.set_edge_attributes(cfg, {(u, v): "CFG" for u, v in cfg.edges()}, "graph_type")
-        nx.set_edge_attributes(duc, {(u, v): "DUC" for u, v in duc.edges()}, "graph_type")
+        nx.set_edge_attributes(ast, "AST", "graph_type")
+        nx.set_edge_attributes(cfg, "CFG", "graph_type")
+        nx.set_edge_attributes(duc, "DUC", "graph_type")
         max_ast_node = max(ast.nodes())
         cfg = nx.relabel_nodes(
             cfg,
@@ -32,12 +34,19 @@ class CPGParser(BaseParser):
         duc = nx.relabel_nodes(
             duc, {n: attr.get("ast_node") for n, attr in duc.nodes(data=True)}
         )
-        cpg = nx.MultiDiGraph(ast)
-        cpg = nx.compose(cpg, nx.MultiDiGraph(cfg))
-        cpg = nx.compose(cpg, nx.MultiDiGraph(duc))
-
-        labels = {n: {"label": l.replace(":", "_")} for n, l in nx.get_node_attributes(cpg, "label").items()}
-        nx.set_node_attributes(cpg, labels)
+        # merge into one multigraph like nx.compose, without copying the result for each graph;
+        # graph attributes are carried over as compose does;
+        # edges get key 0 as in nx.MultiDiGraph(g), so later graphs update attributes of overlapping edges
+        cpg = nx.MultiDiGraph()
+        for g in (ast, cfg, duc):
+            cpg.graph.update(g.graph)
+            cpg.add_nodes_from(g.nodes(data=True))
+            cpg.add_edges_from((u, v, 0, attr) for u, v, attr in g.edges(data=True))
+
+        # ":" would be read as a port separator when the CPG is laid out with pydot
+        for _, attr in cpg.nodes(data=True):
+            if "label" in attr:
+                attr["label"] = attr["label"].replace(":", "_")
 
         cpg.graph["graph_type"] = "CPG"
         cpg.graph["parents"] = {
@@ -51,21 +60,27 @@ class CPGParser(BaseParser):
     @staticmethod
     def draw(cpg):
         from matplotlib import pyplot as plt
+        # strip everything but the label and collect the labels in the same pass
+        labels = {}
         for (n,d) in cpg.nodes(data=True):
             for k in list(d.keys()):
                 if k != "label":
                     del d[k]
+            labels[n] = d.get("label", "<NO LABEL>")
         pos = nx.nx_pydot.graphviz_layout(cpg, prog="dot")
         # TODO: remove AST subtrees without CFG/DUC edges
         nx.draw(cpg, pos=pos)
         nx.draw_networkx_labels(
             cpg,
             pos=pos,
-            labels={
-                n: attr.get("label", "<NO LABEL>")
-                for n, attr in cpg.nodes(data=True)
-            },
+            labels=labels,
         )
+        # bucket the edges by graph type and collect their labels in one pass
+        edgelists = defaultdict(list)
+        edge_labels = {}
+        for u, v, attr in cpg.edges(data=True):
+            edgelists[attr["graph_type"]].append((u, v))
+            edge_labels[(u, v)] = attr.get("label", "")
         for graph_type, color in {
             "AST": "black",
             "CFG": "blue",
@@ -75,19 +90,12 @@ class CPGParser(BaseParser):
                 cpg,
                 pos=pos,
                 edge_color=color,
-                edgelist=[
-                    (u, v)
-                    for u, v, k, attr in cpg.edges(keys=True, data=True)
-                    if attr["graph_type"] == graph_type
-                ],
+                edgelist=edgelists[graph_type],
             )
         nx.draw_networkx_edge_labels(
             cpg,
             pos=pos,
-            edge_labels={
-                (u, v): attr.get("label", "")
-                for u, v, k, attr in cpg.edges(keys=True, data=True)
-            },
+            edge_labels=edge_labels,
         )
 
         import matplotlib.lines as mlines
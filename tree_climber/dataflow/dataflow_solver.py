@@ -1,3 +1,44 @@
+import heapq
+
+
+def from_bitmask(bits):
+    """Decode an int bitmask into the set of indexes of its 1 bits."""
+    facts = set()
+    while bits:
+        low = bits & -bits
+        facts.add(low.bit_length() - 1)
+        bits ^= low
+    return facts
+
+
+def reverse_postorder(succs):
+    """
+    Return the nodes of a graph in reverse postorder, given its successor dict.
+    Successors are searched last-added first. The CFG adds a loop's body edge before its exit edge,
+    so this puts each loop body before the code after the loop,
+    and the loop settles before its facts flow on.
+    """
+    seen = set()
+    postorder = []
+    for root in succs:
+        if root in seen:
+            continue
+        seen.add(root)
+        stack = [(root, reversed(list(succs[root])))]
+        while stack:
+            n, children = stack[-1]
+            for child in children:
+                if child not in seen:
+                    seen.add(child)
+                    stack.append((child, reversed(list(succs[child]))))
+                    break
+            else:
+                stack.pop()
+                postorder.append(n)
+    postorder.reverse()
+    return postorder
+
+
 class DataflowSolver:
     """
     generic dataflow problem solver with worklist algorithm
@@ -11,6 +52,11 @@ class DataflowSolver:
     - for each CFG node n, a dataflow function fn : D → D (that defines the effect of executing n). 
     """
 
+    # Set in subclasses whose dataflow facts are dense indexes 0..N-1, such as definitions.
+    # Then get_transfer_inputs returns GEN and KILL as int bitmasks, where bit i means fact i,
+    # and the solution is decoded back to sets at the end.
+    bitset = False
+
     def __init__(self, cfg, verbose, direction):
         self.cfg = cfg
         self.verbose = verbose
@@ -22,64 +68,128 @@ class DataflowSolver:
             "backward": self.solve_backward,
         }[self.direction]()
 
+    def get_transfer_inputs(self):
+        """
+        Compute GEN and KILL for each node once, since they do not change while solving.
+        Also return the CFG's predecessors and successors.
+        """
+        gen = {}
+        kill = {}
+        for n in self.cfg.nodes():
+            gen[n] = self.gen(n)
+            kill[n] = self.kill(n)
+        return gen, kill, self.cfg.pred, self.cfg.succ
+
+    def get_operators(self):
+        """Return the meet (union) and transfer functions for sets, or for int bitmasks if self.bitset."""
+        if self.bitset:
+            def meet(values):
+                result = 0
+                for v in values:
+                    result |= v
+                return result
+
+            def transfer(gen, x, kill):
+                return gen | (x & ~kill)
+        else:
+            def meet(values):
+                return set().union(*values)
+
+            def transfer(gen, x, kill):
+                return gen.union(x.difference(kill))
+        return meet, transfer
+
+    def show(self, facts):
+        """Return facts as a set for printing, decoding them if they are an int bitmask."""
+        return from_bitmask(facts) if self.bitset else facts
+
+    def decode(self, _in, out):
+        """Return the solution as sets of facts."""
+        if self.bitset:
+            _in = {n: from_bitmask(b) for n, b in _in.items()}
+            out = {n: from_bitmask(b) for n, b in out.items()}
+        return _in, out
+
     def solve_backward(self):
         _in = {}
         out = {}
         for n in self.cfg.nodes():
-            _in[n] = set()  # can optimize by OUT[n] = GEN[n];
+            _in[n] = 0 if self.bitset else set()  # can optimize by OUT[n] = GEN[n];
             if self.verbose >= 1:
                 print(n, repr(self.cfg.nodes[n]["label"]))
 
-        q = list(reversed(list(self.cfg.nodes())))
+        gen, kill, preds, succs = self.get_transfer_inputs()
+        meet, transfer = self.get_operators()
+
+        # visit nodes in reverse postorder of the reversed CFG so that successors are usually solved first;
+        # the worklist is a heap of positions in that order, so a changed node is revisited before the nodes after it
+        order = reverse_postorder(preds)
+        position = {n: i for i, n in enumerate(order)}
+        q = list(range(len(order)))
+        in_q = set(order)
         i = 0
         while q:
-            n = q.pop(0)
+            n = order[heapq.heappop(q)]
+            in_q.discard(n)
 
-            out[n] = set()
-            for succ in self.cfg.successors(n):
-                out[n] = out[n].union(_in[succ])
+            out[n] = meet(_in[succ] for succ in succs[n])
 
-            new_in_n = self.gen(n).union(out[n].difference(self.kill(n)))
+            new_in_n = transfer(gen[n], out[n], kill[n])
 
             if self.verbose >= 2:
-                print(f"{i=}, {n=}, {_in=}, {out=}, {new_in_n=}")
+                shown_in = {m: self.show(facts) for m, facts in _in.items()}
+                shown_out = {m: self.show(facts) for m, facts in out.items()}
+                print(f"{i=}, {n=}, _in={shown_in}, out={shown_out}, new_in_n={self.show(new_in_n)}")
 
             if _in[n] != new_in_n:
                 if self.verbose >= 1:
-                    print(f"{i=}, {n=} changed {_in[n]} -> {new_in_n}")
+                    print(f"{i=}, {n=} changed {self.show(_in[n])} -> {self.show(new_in_n)}")
                 _in[n] = new_in_n
-                for pred in self.cfg.predecessors(n):
-                    q.append(pred)
+                for pred in preds[n]:
+                    if pred not in in_q:
+                        heapq.heappush(q, position[pred])
+                        in_q.add(pred)
             i += 1
 
-        return _in, out
+        return self.decode(_in, out)
 
     def solve_forward(self):
         _in = {}
         out = {}
         for n in self.cfg.nodes():
-            out[n] = set()  # can optimize by OUT[n] = GEN[n];
+            out[n] = 0 if self.bitset else set()  # can optimize by OUT[n] = GEN[n];
 
-        q = list(self.cfg.nodes())
+        gen, kill, preds, succs = self.get_transfer_inputs()
+        meet, transfer = self.get_operators()
+
+        # visit nodes in reverse postorder so that predecessors are usually solved first;
+        # the worklist is a heap of positions in that order, so a changed node is revisited before the nodes after it
+        order = reverse_postorder(succs)
+        position = {n: i for i, n in enumerate(order)}
+        q = list(range(len(order)))
+        in_q = set(order)
         i = 0
         while q:
-            n = q.pop(0)
+            n = order[heapq.heappop(q)]
+            in_q.discard(n)
 
-            _in[n] = set()
-            for pred in self.cfg.predecessors(n):
-                _in[n] = _in[n].union(out[pred])
+            _in[n] = meet(out[pred] for pred in preds[n])
 
-            new_out_n = self.gen(n).union(_in[n].difference(self.kill(n)))
+            new_out_n = transfer(gen[n], _in[n], kill[n])
 
             if self.verbose >= 2:
-                print(f"{i=}, {n=}, {_in=}, {out=}, {new_out_n=}")
+                shown_in = {m: self.show(facts) for m, facts in _in.items()}
+                shown_out = {m: self.show(facts) for m, facts in out.items()}
+                print(f"{i=}, {n=}, _in={shown_in}, out={shown_out}, new_out_n={self.show(new_out_n)}")
 
             if out[n] != new_out_n:
                 if self.verbose >= 1:
-                    print(f"{i=}, {n=} changed {out[n]} -> {new_out_n}")
+                    print(f"{i=}, {n=} changed {self.show(out[n])} -> {self.show(new_out_n)}")
                 out[n] = new_out_n
-                for succ in self.cfg.successors(n):
-                    q.append(succ)
+                for succ in succs[n]:
+                    if succ not in in_q:
+                        heapq.heappush(q, position[succ])
+                        in_q.add(succ)
             i += 1
 
-        return _in, out
+        return self.decode(_in, out)
@@ -1,33 +1,17 @@
 from tree_climber.dataflow.dataflow_solver import DataflowSolver
+from tree_climber.dataflow.reaching_def import get_definition
 
 
-def get_definition(ast_node):
-    # TODO: Refactor to common library of robust utilities for getting defs/uses
-    if ast_node.type == "identifier":
-        return ast_node.text.decode()
-    elif ast_node.type == "pointer_declarator":
-        return get_definition(ast_node.children[1])
-    elif ast_node.type == "init_declarator":
-        return get_definition(ast_node.children[0])
-    elif ast_node.type == "declaration":
-        return get_definition(ast_node.children[1])
-    elif ast_node.type == "assignment_expression":
-        return get_definition(ast_node.children[0])
-    elif ast_node.type == "update_expression":
-        return get_definition(ast_node.children[0])
-    elif ast_node.type == "expression_statement":
-        return get_definition(ast_node.children[0])
-    return None
-
 def get_uses(cfg, n):
     """return the set of variables used in n"""
     # TODO: Exclude functions that are called
     used_ids = set()
     attr = cfg.nodes[n]
     if "n" in attr:
+        # the result is a set, so visit in stack order to avoid shifting the list on every pop
         q = [attr["n"]]
         while q:
-            n = q.pop(0)
+            n = q.pop()
             if n.type == "identifier":
                 _id = n.text.decode()
                 used_ids.add(_id)
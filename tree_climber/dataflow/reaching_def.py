@@ -1,22 +1,28 @@
+from collections import defaultdict
+
 from tree_climber.dataflow.dataflow_solver import DataflowSolver
 
 
+# node type -> index of the child which leads to the defined identifier
+DEFINITION_CHILD = {
+    "pointer_declarator": 1,
+    "init_declarator": 0,
+    "declaration": 1,
+    "assignment_expression": 0,
+    "update_expression": 0,
+    "expression_statement": 0,
+}
+
+
 def get_definition(ast_node):
-    if ast_node.type == "identifier":
-        return ast_node.text.decode()
-    elif ast_node.type == "pointer_declarator":
-        return get_definition(ast_node.children[1])
-    elif ast_node.type == "init_declarator":
-        return get_definition(ast_node.children[0])
-    elif ast_node.type == "declaration":
-        return get_definition(ast_node.children[1])
-    elif ast_node.type == "assignment_expression":
-        return get_definition(ast_node.children[0])
-    elif ast_node.type == "update_expression":
-        return get_definition(ast_node.children[0])
-    elif ast_node.type == "expression_statement":
-        return get_definition(ast_node.children[0])
-    return None
+    node_type = ast_node.type
+    while node_type != "identifier":
+        child_idx = DEFINITION_CHILD.get(node_type)
+        if child_idx is None:
+            return None
+        ast_node = ast_node.children[child_idx]
+        node_type = ast_node.type
+    return ast_node.text.decode()
 
 
 class ReachingDefinitionSolver(DataflowSolver):
@@ -25,14 +31,18 @@ class ReachingDefinitionSolver(DataflowSolver):
     https://en.wikipedia.org/wiki/Reaching_definition
     """
 
+    # definitions are numbered 0..N-1 in the order they are found
+    bitset = True
+
     def __init__(self, cfg, verbose=0):
         super().__init__(cfg, verbose, "forward")
 
         node2def = {}
         def2node = {}
-        id2def = {}
+        id2def = defaultdict(set)
         def2id = {}
         def2code = {}
+        id2mask = defaultdict(int)
         def_idx = 0
         for n in cfg.nodes():
             attr = cfg.nodes[n]
@@ -43,13 +53,14 @@ class ReachingDefinitionSolver(DataflowSolver):
                     node2def[n] = def_idx
                     def2node[def_idx] = n
 
-                    if _id not in id2def:
-                        id2def[_id] = set()
                     id2def[_id].add(def_idx)
+                    id2mask[_id] |= 1 << def_idx
                     def2id[def_idx] = _id
-                    def2code[def_idx] = ast_node.text.decode()
+                    def2code[def_idx] = attr["code"]
 
                     def_idx += 1
+        id2def = dict(id2def)
+        id2mask = dict(id2mask)
         if verbose >= 1:
             print("node2def", node2def)
             print("def2node", def2node)
@@ -61,24 +72,21 @@ class ReachingDefinitionSolver(DataflowSolver):
         self.id2def = id2def
         self.def2id = def2id
         self.def2code = def2code
+        self.id2mask = id2mask
 
-    def gen(self, n) -> set:
-        if n in self.node2def:
-            d = self.node2def[n]
-            if self.verbose >= 2:
-                print("gen", n, d)
-            return {d}
-        else:
-            return set()
-
-    def kill(self, n) -> set:
-        if n in self.node2def:
-            d = self.node2def[n]
-            if d in self.def2id:
+    def get_transfer_inputs(self):
+        """GEN is the bit of a node's definition, KILL is the bits of all definitions of the same variable."""
+        gen = {}
+        kill = {}
+        for n in self.cfg.nodes():
+            d = self.node2def.get(n)
+            if d is None:
+                gen[n] = kill[n] = 0
+            else:
                 i = self.def2id[d]
-                if i in self.id2def:
-                    if self.verbose >= 2:
-                        print("kill", n, self.id2def[i])
-                    return self.id2def[i]
-        else:
-            return set()
+                if self.verbose >= 2:
+                    print("gen", n, d)
+                    print("kill", n, self.id2def[i])
+                gen[n] = 1 << d
+                kill[n] = self.id2mask[i]
+        return gen, kill, self.cfg.pred, self.cfg.succ
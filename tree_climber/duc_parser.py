@@ -12,14 +12,15 @@ def get_uses(cfg, solver, n):
     if "n" in attr:
         q = [attr["n"]]
         while q:
-            n = q.pop(0)
+            n = q.pop()
             if n.type == "identifier":
                 _id = n.text.decode()
-                if _id in solver.id2def.keys():
+                if _id in solver.id2def:
                     used_ids.add(_id)
             q.extend(n.children)
     return used_ids
 
+
 class DUCParser(BaseParser):
     @staticmethod
     def parse(data, verbose=0):
@@ -59,7 +60,7 @@ class DUCParser(BaseParser):
 
         # Start with the CFG nodes
         duc.add_nodes_from(
-            [(n, dict(cfg_node=n, **attr)) for n, attr in cfg.nodes(data=True)]
+            (n, dict(cfg_node=n, **attr)) for n, attr in cfg.nodes(data=True)
         )
 
         # Do dataflow analysis
@@ -67,26 +68,19 @@ class DUCParser(BaseParser):
         solution, _ = solver.solve()
         
         # Find all DUC edges.
+        # An edge goes from each incoming definition to n if n uses the defined variable.
+        # Each definition has its own node, so one pass over the incoming definitions finds every edge.
+        def2id = solver.def2id
+        def2node = solver.def2node
         for n in cfg.nodes():
             incoming_defs = solution[n]
             if len(incoming_defs) > 0:
                 use_node = n
-
-                # TODO: Make utility methods
-                def_ids = set(map(solver.def2id.__getitem__, incoming_defs))
                 used_ids = get_uses(cfg, solver, use_node)
-                used_def_ids = def_ids & used_ids
-                if len(used_def_ids) > 0:
-                    used_defs = set.union(*map(solver.id2def.__getitem__, used_def_ids))
-                    used_incoming_defs = used_defs & incoming_defs
-
-                    def_nodes = set(map(solver.def2node.__getitem__, used_incoming_defs))
-                    for def_node in def_nodes:
-                        duc.add_edge(
-                            def_node,
-                            use_node,
-                            label=str(solver.def2id[solver.node2def[def_node]]),
-                        )
+                for d in incoming_defs:
+                    _id = def2id[d]
+                    if _id in used_ids:
+                        duc.add_edge(def2node[d], use_node, label=_id)
         duc.remove_nodes_from(
             [
                 n
@@ -2,6 +2,8 @@ import networkx as nx
 
 class Counter:
     """Utility class to keep track of an incrementable counter."""
+    __slots__ = ("_id",)
+
     def __init__(self):
         self._id = 0
     
@@ -9,8 +11,8 @@ class Counter:
         return self._id
     
     def get_and_increment(self):
-        _id = self.get()
-        self._id += 1
+        _id = self._id
+        self._id = _id + 1
         return _id
 
 def extract_subgraph(G, edge_type):
@@ -23,3 +25,68 @@ def extract_subgraph(G, edge_type):
             if attr["graph_type"] == edge_type
         ],
     )
+
+def dense_descendants(G, source, num_nodes):
+    """
+    Return the nodes reachable from source, like nx.descendants,
+    for a graph whose nodes are the integers 0..num_nodes-1.
+    Tracks visited nodes in a bytearray instead of a set.
+    """
+    visited = bytearray(num_nodes)
+    visited[source] = 1
+    stack = [source]
+    descendants = []
+    while stack:
+        for succ in G.adj[stack.pop()]:
+            if not visited[succ]:
+                visited[succ] = 1
+                stack.append(succ)
+                descendants.append(succ)
+    return descendants
+
+# Integer codes for CFG edge labels, used by to_csr.
+EDGE_LABEL_CODES = {
+    None: 0,
+    "True": 1,
+    "False": 2,
+    "break": 3,
+    "continue": 4,
+    "goto": 5,
+    "return": 6,
+}
+CASE_EDGE_CODE = 7
+OTHER_EDGE_CODE = 8
+
+def edge_label_code(label):
+    """
+    Get the integer code of a CFG edge label.
+    Switch case labels (the source text of the case, e.g. "case 1:" or "default :") all share one code,
+    and any other label which is not in EDGE_LABEL_CODES gets OTHER_EDGE_CODE.
+    """
+    if label is not None and label.startswith(("case", "default")):
+        return CASE_EDGE_CODE
+    return EDGE_LABEL_CODES.get(label, OTHER_EDGE_CODE)
+
+def to_csr(cfg):
+    """
+    Convert the adjacency of a CFG to compressed sparse row (CSR) arrays.
+    Returns (nodes, offsets, targets, edge_labels) where nodes[i] is the CFG node at index i,
+    the successors of node i are targets[offsets[i]:offsets[i+1]] (as indices into nodes),
+    and edge_labels holds the edge_label_code of each of those edges.
+    Requires numpy, which is installed with the csr extra (pip install tree-climber[csr]).
+    """
+    import numpy as np
+
+    nodes = sorted(cfg.nodes())
+    index = {n: i for i, n in enumerate(nodes)}
+    offsets = np.zeros(len(nodes) + 1, dtype=np.int32)
+    targets = np.empty(cfg.number_of_edges(), dtype=np.int32)
+    edge_labels = np.empty(cfg.number_of_edges(), dtype=np.int8)
+    j = 0
+    for i, n in enumerate(nodes):
+        for succ, attr in cfg.adj[n].items():
+            targets[j] = index[succ]
+            edge_labels[j] = edge_label_code(attr.get("label", None))
+            j += 1
+        offsets[i + 1] = j
+    return nodes, offsets, targets, edge_labels